@@ -0,0 +1 @@
+"""Reproducible benchmark suite for the LD linkage mapper pipeline."""
@@ -0,0 +1,96 @@
+"""Local fake LDlink server for client throughput benchmarks.
+
+Serves ``/LDlinkRest/ldproxy`` from a :class:`SyntheticBiobank` on a
+loopback port so ``LDProxyClient`` can be exercised end to end without
+network access or an API token.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from .synthetic import SyntheticBiobank
+
+PATH = "/LDlinkRest/ldproxy"
+
+
+class FakeLDlinkServer:
+    """Threaded HTTP server answering LDproxy queries from canned responses.
+
+    Parameters
+    ----------
+    biobank : SyntheticBiobank
+        Source of response bodies; unknown targets are generated on demand.
+    latency : float
+        Artificial per-request delay in seconds.
+    """
+
+    def __init__(self, biobank: SyntheticBiobank, latency: float = 0.0) -> None:
+        self.biobank = biobank
+        self.latency = latency
+        self.requests = 0
+        self._cache: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        if self._httpd is None:
+            raise RuntimeError("Server is not running")
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{PATH}"
+
+    def _body(self, target: str) -> bytes:
+        with self._lock:
+            self.requests += 1
+            body = self._cache.get(target)
+            if body is None:
+                body = self._cache[target] = self.biobank.ldproxy_response(target).encode("utf-8")
+        return body
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                url = urllib.parse.urlsplit(self.path)
+                params = urllib.parse.parse_qs(url.query)
+                if url.path != PATH or "var" not in params:
+                    self.send_error(404)
+                    return
+                if server.latency:
+                    time.sleep(server.latency)
+                body = server._body(params["var"][0])
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> "FakeLDlinkServer":
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> "FakeLDlinkServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
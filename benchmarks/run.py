@@ -0,0 +1,300 @@
+"""Benchmark runner.
+
+Times the parser and filter stages once and the mapper stages at several
+participant scales, measures LDProxyClient throughput against a local fake
+LDlink server, and writes machine-readable JSON that can be compared against
+a baseline run.
+
+Usage::
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --scales 1000 10000 --output quick.json
+    python -m benchmarks.run --output new.json --compare bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import ld_mapper
+from ld_mapper import FilteredResult, LDProxyClient, ParticipantMapper, ProxyFilter
+
+from .fake_ldlink import FakeLDlinkServer
+from .synthetic import SyntheticBiobank
+
+DEFAULT_SCALES = [1_000, 10_000, 100_000, 1_000_000]
+
+# Run options recorded in ``meta`` that must match for two reports to be comparable.
+_RUN_SETTINGS = ("repeat", "queries", "server_latency")
+
+
+def measure(fn: Callable[[], Any], repeat: int = 3) -> Dict[str, Any]:
+    """Time ``fn`` ``repeat`` times, then run it once more under tracemalloc.
+
+    Timing runs are kept separate from the memory run because tracemalloc
+    slows allocation-heavy code considerably.
+    """
+    runs: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "runs": runs,
+        "min_seconds": min(runs),
+        "median_seconds": statistics.median(runs),
+        "peak_bytes": peak,
+    }
+
+
+def _report_case(name: str, scale: int, stats: Dict[str, Any], unit: str = "n") -> Dict[str, Any]:
+    print(f"  {name:<24} {unit}={scale:<9} "
+          f"median={stats['median_seconds']:.4f}s peak={stats['peak_bytes'] / 1e6:.1f}MB")
+    return {"name": name, "scale": scale, **stats}
+
+
+def bench_proxy_stages(biobank: SyntheticBiobank, repeat: int) -> Tuple[List[Dict[str, Any]], List[FilteredResult]]:
+    """Benchmark parsing and filtering, which depend on targets, not participants.
+
+    Returns the results (scaled by target count) and the filtered proxies
+    used as input to the mapper benchmarks.
+    """
+    responses = biobank.ldproxy_responses()
+    client = LDProxyClient()
+    proxy_filter = ProxyFilter(min_r2=1.0, blocklist=biobank.blocklist())
+    parsed = [client._parse_response(text, target) for target, text in responses.items()]
+
+    results = [
+        _report_case(
+            "proxy.parse_response", biobank.n_targets,
+            measure(lambda: [client._parse_response(t, r) for r, t in responses.items()], repeat=repeat),
+            unit="t",
+        ),
+        _report_case(
+            "filter.filter_batch", biobank.n_targets,
+            measure(lambda: proxy_filter.filter_batch(parsed), repeat=repeat),
+            unit="t",
+        ),
+    ]
+    return results, proxy_filter.filter_batch(parsed)
+
+
+def bench_scale(
+    biobank: SyntheticBiobank,
+    filtered: List[FilteredResult],
+    workdir: Path,
+    repeat: int,
+) -> List[Dict[str, Any]]:
+    """Run the mapper benchmarks for one participant scale.
+
+    Each case builds its own inputs and drops them before the next case, so
+    at most one participant-sized mapper or mapping is alive while timing.
+    """
+    n = biobank.n_participants
+    participant_file = biobank.write_participant_file(workdir / f"participants_{n}.csv")
+    out = workdir / "availability.csv"
+    results = []
+    try:
+        results.append(_report_case("mapper.load", n, measure(lambda: ParticipantMapper(participant_file), repeat)))
+
+        mapper = ParticipantMapper(participant_file)
+        results.append(_report_case("mapper.map", n, measure(lambda: mapper.map(filtered), repeat)))
+        mapping = mapper.map(filtered)
+        del mapper
+
+        results.append(_report_case(
+            "mapper.export_csv", n, measure(lambda: ParticipantMapper.export_csv(mapping, out), repeat),
+        ))
+        del mapping
+    finally:
+        participant_file.unlink()
+        out.unlink(missing_ok=True)
+    return results
+
+
+def bench_client(biobank: SyntheticBiobank, queries: int, latency: float, repeat: int) -> Dict[str, Any]:
+    """Measure end-to-end ``LDProxyClient.query_batch`` throughput.
+
+    An untimed warm-up batch fills the server's response cache first, so
+    neither the timings nor the memory run include generating the synthetic
+    responses. The server runs in-process, so ``peak_bytes`` still counts
+    its request-handling allocations alongside the client's.
+    """
+    rsids = [f"rs{i + 1}" for i in range(queries)]
+    with FakeLDlinkServer(biobank, latency=latency) as server:
+        client = LDProxyClient(token="benchmark", rate_limit=0.0)
+        client.BASE_URL = server.base_url
+        client.query_batch(rsids)
+        stats = measure(lambda: client.query_batch(rsids), repeat=repeat)
+    stats["queries_per_second"] = queries / stats["median_seconds"]
+    stats["peak_bytes_includes_server"] = True
+    print(f"  {'proxy.query_batch':<24} q={queries:<9} "
+          f"median={stats['median_seconds']:.4f}s ({stats['queries_per_second']:.0f} q/s)")
+    return {"name": "proxy.query_batch", "scale": queries, **stats}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def _settings_diff(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Describe generator params and run settings that differ between two reports."""
+    cur, base = current.get("meta", {}), baseline.get("meta", {})
+    cur_params, base_params = cur.get("params", {}), base.get("params", {})
+    diffs = [
+        f"{key}: {base_params.get(key)!r} -> {cur_params.get(key)!r}"
+        for key in sorted(set(cur_params) | set(base_params))
+        if cur_params.get(key) != base_params.get(key)
+    ]
+    for key in _RUN_SETTINGS:
+        if cur.get(key) != base.get(key):
+            diffs.append(f"{key}: {base.get(key)!r} -> {cur.get(key)!r}")
+    return diffs
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float,
+) -> Tuple[List[str], List[str]]:
+    """Compare ``current`` against ``baseline`` and return ``(regressions, notes)``.
+
+    A case regresses when its best run slowed by more than ``threshold``, or
+    when it is present in the baseline but missing from the current run.
+    Cases only in the current run are reported as notes. The minimum is
+    compared rather than the median as it is the least sensitive to
+    scheduler noise on shared machines.
+
+    Raises
+    ------
+    ValueError
+        If the two runs used different generator params, repeat counts,
+        client query counts or fake-server latency.
+    """
+    diffs = _settings_diff(current, baseline)
+    if diffs:
+        raise ValueError("Baseline was run with different settings: " + "; ".join(diffs))
+
+    cur = {(r["name"], r["scale"]): r for r in current["results"]}
+    base = {(r["name"], r["scale"]): r for r in baseline["results"]}
+    regressions: List[str] = []
+    notes: List[str] = []
+    for key in sorted(set(base) | set(cur)):
+        name, scale = key
+        new, old = cur.get(key), base.get(key)
+        if new is None:
+            regressions.append(f"{name} (scale={scale}): missing from current run")
+        elif old is None:
+            notes.append(f"{name} (scale={scale}): not in baseline")
+        elif old["min_seconds"] > 0:
+            ratio = new["min_seconds"] / old["min_seconds"]
+            if ratio > 1 + threshold:
+                regressions.append(
+                    f"{name} (scale={scale}): {old['min_seconds']:.4f}s -> "
+                    f"{new['min_seconds']:.4f}s ({ratio:.2f}x)"
+                )
+    return regressions, notes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the LD linkage mapper pipeline.")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help="Participant counts to benchmark (e.g. 1000 ... 1000000).")
+    parser.add_argument("--array-variants", type=int, default=10_000)
+    parser.add_argument("--variants-per-participant", type=int, default=20)
+    parser.add_argument("--targets", type=int, default=50)
+    parser.add_argument("--proxies-per-target", type=int, default=200)
+    parser.add_argument("--perfect-fraction", type=float, default=0.1)
+    parser.add_argument("--blocklist-fraction", type=float, default=0.01)
+    parser.add_argument("--queries", type=int, default=200,
+                        help="Queries per client throughput run (0 to skip).")
+    parser.add_argument("--server-latency", type=float, default=0.0,
+                        help="Artificial fake-server delay per request, in seconds.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=Path("bench_results.json"))
+    parser.add_argument("--compare", type=Path, help="Baseline results JSON to check for regressions.")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed best-run slowdown before a case counts as a regression.")
+    args = parser.parse_args(argv)
+
+    template = SyntheticBiobank(
+        n_array_variants=args.array_variants,
+        variants_per_participant=args.variants_per_participant,
+        n_targets=args.targets,
+        proxies_per_target=args.proxies_per_target,
+        perfect_fraction=args.perfect_fraction,
+        blocklist_fraction=args.blocklist_fraction,
+        seed=args.seed,
+    )
+
+    results, filtered = bench_proxy_stages(template, args.repeat)
+    with tempfile.TemporaryDirectory(prefix="ld_mapper_bench_") as tmp:
+        for scale in args.scales:
+            results.extend(bench_scale(replace(template, n_participants=scale), filtered, Path(tmp), args.repeat))
+    if args.queries:
+        results.append(bench_client(template, args.queries, args.server_latency, args.repeat))
+
+    params = asdict(template)
+    params.pop("n_participants")
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "ld_mapper_version": ld_mapper.__version__,
+            "git_commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "queries": args.queries,
+            "server_latency": args.server_latency,
+            "params": params,
+        },
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Wrote {args.output}")
+
+    if args.compare:
+        try:
+            regressions, notes = compare(report, json.loads(args.compare.read_text()), args.threshold)
+        except ValueError as exc:
+            print(f"ERROR {exc}")
+            return 2
+        for line in notes:
+            print(f"NOTE {line}")
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Seeded synthetic biobank generator.
+
+Produces participant-variant files, LDproxy-style API responses and
+blocklists of configurable size. The same seed and parameters always
+produce byte-identical output, so benchmark runs are comparable.
+"""
+
+from __future__ import annotations
+
+import csv
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Set
+
+LDPROXY_HEADER = "\t".join([
+    "RS_Number", "Coord", "Alleles", "MAF", "Distance", "Dprime", "R2",
+    "Correlated_Alleles", "FORGEdb", "RegulomeDB", "Function",
+])
+
+
+@dataclass
+class SyntheticBiobank:
+    """Deterministic generator for benchmark inputs.
+
+    Parameters
+    ----------
+    n_participants : int
+        Number of participants in the participant-variant file.
+    n_array_variants : int
+        Number of distinct variants on the simulated genotyping array.
+    variants_per_participant : int
+        Array variants recorded per participant.
+    n_targets : int
+        Number of target rsIDs to generate LDproxy responses for.
+    proxies_per_target : int
+        Rows per LDproxy response.
+    perfect_fraction : float
+        Fraction of proxy rows with R² = 1.0.
+    malformed_fraction : float
+        Fraction of proxy rows that are truncated or non-numeric.
+    blocklist_fraction : float
+        Fraction of array variants placed on the blocklist.
+    seed : int
+        Random seed.
+    """
+
+    n_participants: int = 1_000
+    n_array_variants: int = 10_000
+    variants_per_participant: int = 20
+    n_targets: int = 50
+    proxies_per_target: int = 200
+    perfect_fraction: float = 0.1
+    malformed_fraction: float = 0.01
+    blocklist_fraction: float = 0.01
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        self._array: List[str] = [f"rs{1_000_000 + i}" for i in range(self.n_array_variants)]
+
+    def _rng(self, stream: str) -> random.Random:
+        """Return an independent RNG per output so each is stable on its own."""
+        return random.Random(f"{self.seed}:{stream}")
+
+    @property
+    def array_variants(self) -> List[str]:
+        return list(self._array)
+
+    @property
+    def targets(self) -> List[str]:
+        return [f"rs{i + 1}" for i in range(self.n_targets)]
+
+    def write_participant_file(self, path: str | Path, delimiter: str = ",") -> Path:
+        """Write a ``participant_id,variant_id`` file with one row per call."""
+        rng = self._rng("participants")
+        k = min(self.variants_per_participant, len(self._array))
+        width = len(str(self.n_participants))
+        with open(path, "w", newline="") as fh:
+            writer = csv.writer(fh, delimiter=delimiter)
+            writer.writerow(["participant_id", "variant_id"])
+            for i in range(self.n_participants):
+                pid = f"P{i:0{width}d}"
+                for vid in rng.sample(self._array, k):
+                    writer.writerow([pid, vid])
+        return Path(path)
+
+    def ldproxy_response(self, target: str) -> str:
+        """Return a tab-delimited LDproxy response body for ``target``."""
+        rng = self._rng(f"ldproxy:{target}")
+        lines = [LDPROXY_HEADER]
+        for _ in range(self.proxies_per_target):
+            rsid = rng.choice(self._array)
+            distance = rng.randint(0, 500_000)
+            if rng.random() < self.perfect_fraction:
+                r2, dprime = "1.0", "1.0"
+            else:
+                r2 = f"{rng.uniform(0.0, 0.99):.4f}"
+                dprime = f"{rng.uniform(float(r2), 1.0):.4f}"
+            row = [
+                rsid, f"chr6:{32_000_000 + distance}", "(A/G)",
+                f"{rng.uniform(0.01, 0.5):.4f}", str(distance), dprime, r2,
+                "A=A,G=G", "5", "7", "intergenic",
+            ]
+            if rng.random() < self.malformed_fraction:
+                row = row[:3] if rng.random() < 0.5 else row[:6] + ["NA"] + row[7:]
+            lines.append("\t".join(row))
+        return "\n".join(lines) + "\n"
+
+    def ldproxy_responses(self) -> Dict[str, str]:
+        """Return ``{target: response_text}`` for every target."""
+        return {t: self.ldproxy_response(t) for t in self.targets}
+
+    def blocklist(self) -> Set[str]:
+        rng = self._rng("blocklist")
+        k = int(len(self._array) * self.blocklist_fraction)
+        return set(rng.sample(self._array, k))
+
+    def write_blocklist(self, path: str | Path) -> Path:
+        Path(path).write_text("".join(f"{rsid}\n" for rsid in sorted(self.blocklist())))
+        return Path(path)
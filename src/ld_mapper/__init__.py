@@ -5,6 +5,7 @@ __version__ = "2.0.0"
 from .proxy import LDProxyClient, ProxyResult
 from .filter import ProxyFilter, FilteredResult
 from .mapper import ParticipantMapper, MappingResult
+from .metrics import Metrics
 
 __all__ = [
     "LDProxyClient",
@@ -13,4 +14,5 @@ __all__ = [
     "FilteredResult",
     "ParticipantMapper",
     "MappingResult",
+    "Metrics",
 ]
@@ -10,6 +10,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Set
 
+from .metrics import Metrics
 from .proxy import ProxyResult, ProxyVariant
 
 
@@ -35,39 +36,50 @@ class ProxyFilter:
         Minimum R² to retain a proxy. Default 1.0 (perfect LD).
     blocklist : set of str, optional
         rsIDs to exclude from results.
+    metrics : Metrics, optional
+        Collector for retained, below-threshold and blocklisted counts.
     """
 
     def __init__(
         self,
         min_r2: float = 1.0,
         blocklist: Set[str] | None = None,
+        metrics: Metrics | None = None,
     ) -> None:
         self.min_r2 = min_r2
         self.blocklist = blocklist or set()
+        self.metrics = metrics if metrics is not None else Metrics.disabled()
 
     @classmethod
     def from_blocklist_file(
         cls,
         path: str | Path,
         min_r2: float = 1.0,
+        metrics: Metrics | None = None,
     ) -> "ProxyFilter":
         """Create a filter loading the blocklist from a file."""
         with open(path) as fh:
             blocklist = {line.strip() for line in fh if line.strip()}
-        return cls(min_r2=min_r2, blocklist=blocklist)
+        return cls(min_r2=min_r2, blocklist=blocklist, metrics=metrics)
 
     def filter(self, result: ProxyResult) -> FilteredResult:
         """Filter a single proxy result."""
         filtered = FilteredResult(target_rsid=result.target_rsid)
+        below_r2 = 0
         for proxy in result.proxies:
             if proxy.r2 < self.min_r2:
+                below_r2 += 1
                 continue
             if proxy.rsid in self.blocklist:
                 filtered.excluded_count += 1
                 continue
             filtered.filtered_proxies.append(proxy)
+        self.metrics.incr("proxies_retained", filtered.count)
+        self.metrics.incr("proxies_below_r2", below_r2)
+        self.metrics.incr("proxies_blocklisted", filtered.excluded_count)
         return filtered
 
     def filter_batch(self, results: List[ProxyResult]) -> List[FilteredResult]:
         """Filter multiple proxy results."""
-        return [self.filter(r) for r in results]
+        with self.metrics.stage("filter.batch"):
+            return [self.filter(r) for r in results]
@@ -12,6 +12,7 @@ from pathlib import Path
 from typing import Dict, List, Set
 
 from .filter import FilteredResult
+from .metrics import Metrics
 
 
 @dataclass
@@ -41,6 +42,8 @@ class ParticipantMapper:
         Column name for participant IDs.
     variant_col : str
         Column name for variant IDs.
+    metrics : Metrics, optional
+        Collector for load/map/export timings and participant counts.
     """
 
     def __init__(
@@ -48,9 +51,13 @@ class ParticipantMapper:
         participant_file: str | Path,
         participant_col: str = "participant_id",
         variant_col: str = "variant_id",
+        metrics: Metrics | None = None,
     ) -> None:
+        self.metrics = metrics if metrics is not None else Metrics.disabled()
         self._participant_variants: Dict[str, Set[str]] = {}
-        self._load(participant_file, participant_col, variant_col)
+        with self.metrics.stage("mapper.load"):
+            self._load(participant_file, participant_col, variant_col)
+        self.metrics.set_gauge("participants_loaded", len(self._participant_variants))
 
     def _load(self, path: str | Path, pid_col: str, var_col: str) -> None:
         """Load participant-variant data from a CSV/TSV file."""
@@ -58,11 +65,17 @@ class ParticipantMapper:
             dialect = csv.Sniffer().sniff(fh.read(2048))
             fh.seek(0)
             reader = csv.DictReader(fh, dialect=dialect)
+            loaded = skipped = 0
             for row in reader:
                 pid = row.get(pid_col, "").strip()
                 vid = row.get(var_col, "").strip()
                 if pid and vid:
                     self._participant_variants.setdefault(pid, set()).add(vid)
+                    loaded += 1
+                else:
+                    skipped += 1
+        self.metrics.incr("participant_rows_loaded", loaded)
+        self.metrics.incr("participant_rows_skipped", skipped)
 
     @property
     def participants(self) -> List[str]:
@@ -74,6 +87,10 @@ class ParticipantMapper:
         For each participant, checks if they carry any proxy variant
         (or the target variant itself) for each target.
         """
+        with self.metrics.stage("mapper.map"):
+            return self._map(filtered_results)
+
+    def _map(self, filtered_results: List[FilteredResult]) -> MappingResult:
         target_rsids = [r.target_rsid for r in filtered_results]
         result = MappingResult(
             target_rsids=target_rsids,
@@ -98,9 +115,11 @@ class ParticipantMapper:
     def export_csv(
         result: MappingResult,
         output_path: str | Path,
+        metrics: Metrics | None = None,
     ) -> None:
         """Export the availability matrix to CSV."""
-        with open(output_path, "w", newline="") as fh:
+        metrics = metrics if metrics is not None else Metrics.disabled()
+        with metrics.stage("mapper.export"), open(output_path, "w", newline="") as fh:
             writer = csv.writer(fh)
             writer.writerow(["participant_id"] + result.target_rsids)
             for pid in sorted(result.availability.keys()):
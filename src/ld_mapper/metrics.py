@@ -0,0 +1,277 @@
+"""Pipeline instrumentation module.
+
+Collects per-stage wall/CPU timings, counters, gauges and latency
+histograms from the proxy, filter and mapper stages, dispatches events
+to optional hook callbacks, and exports the result as JSON or a
+Prometheus textfile.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+Hook = Callable[[str, Dict[str, Any]], None]
+
+logger = logging.getLogger(__name__)
+
+_NAME_RE = re.compile(r"[a-zA-Z_:][a-zA-Z0-9_:]*")
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def peak_rss_bytes() -> int:
+    """Return the peak resident set size of this process in bytes (0 if unknown)."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+@dataclass
+class StageTiming:
+    """Accumulated timings for one named pipeline stage."""
+
+    calls: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+
+
+@dataclass
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    counts: List[int] = field(default_factory=list)
+    count: int = 0
+    total: float = 0.0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * len(self.buckets)
+
+    def observe(self, value: float) -> None:
+        idx = bisect.bisect_left(self.buckets, value)
+        if idx < len(self.counts):
+            self.counts[idx] += 1
+        self.count += 1
+        self.total += value
+
+    def cumulative(self) -> List[int]:
+        """Return per-bucket cumulative counts (excluding ``+Inf``)."""
+        out: List[int] = []
+        running = 0
+        for c in self.counts:
+            running += c
+            out.append(running)
+        return out
+
+
+class Metrics:
+    """Collector shared by the pipeline components.
+
+    Pass one instance to ``LDProxyClient``, ``ProxyFilter`` and
+    ``ParticipantMapper`` to gather metrics across a whole run. A disabled
+    collector (``enabled=False``) turns every recording call into an early
+    return, which is what the components use when none is supplied.
+
+    Parameters
+    ----------
+    enabled : bool
+        Record metrics and dispatch events. Default True.
+    hooks : list of callable, optional
+        Callbacks invoked as ``hook(event, payload)`` for each event.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        hooks: List[Hook] | None = None,
+    ) -> None:
+        self.enabled = enabled
+        self.hooks: List[Hook] = list(hooks or [])
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}
+        self.stages: Dict[str, StageTiming] = {}
+        self.histograms: Dict[str, Histogram] = {}
+
+    @classmethod
+    def disabled(cls) -> "Metrics":
+        """Return a collector that records nothing."""
+        return cls(enabled=False)
+
+    def add_hook(self, hook: Hook) -> None:
+        """Register a callback receiving ``(event, payload)``."""
+        self.hooks.append(hook)
+
+    def emit(self, event: str, **payload: Any) -> None:
+        """Dispatch an event to all registered hooks.
+
+        A failing hook is logged and counted under ``hook_errors``; it never
+        propagates into the pipeline stage that emitted the event.
+        """
+        if not self.enabled:
+            return
+        for hook in self.hooks:
+            try:
+                hook(event, payload)
+            except Exception:
+                logger.exception("Metrics hook %r failed on %r event", hook, event)
+                self.counters["hook_errors"] = self.counters.get("hook_errors", 0) + 1
+
+    def incr(self, name: str, value: float = 1) -> None:
+        """Increment a counter."""
+        if not self.enabled:
+            return
+        if name not in self.counters:
+            _check_name(name)
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Set a gauge to ``value``."""
+        if not self.enabled:
+            return
+        if name not in self.gauges:
+            _check_name(name)
+        self.gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        """Record ``value`` in the named histogram."""
+        if not self.enabled:
+            return
+        hist = self.histograms.get(name)
+        if hist is None:
+            _check_name(name)
+            hist = self.histograms[name] = Histogram()
+        hist.observe(value)
+
+    @contextlib.contextmanager
+    def _timed(self, name: str) -> Iterator[None]:
+        wall0 = time.perf_counter()
+        cpu0 = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall0
+            cpu = time.process_time() - cpu0
+            timing = self.stages.get(name)
+            if timing is None:
+                timing = self.stages[name] = StageTiming()
+            timing.calls += 1
+            timing.wall_seconds += wall
+            timing.cpu_seconds += cpu
+            peak = peak_rss_bytes()
+            if peak > self.gauges.get("peak_memory_bytes", 0):
+                self.gauges["peak_memory_bytes"] = peak
+            self.emit("stage", stage=name, wall_seconds=wall, cpu_seconds=cpu)
+
+    def stage(self, name: str) -> contextlib.AbstractContextManager:
+        """Context manager timing a pipeline stage (wall and CPU)."""
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._timed(name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return all recorded metrics as plain data."""
+        return {
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+            "stages": {k: asdict(v) for k, v in self.stages.items()},
+            "histograms": {
+                k: {
+                    "buckets": list(h.buckets),
+                    "cumulative_counts": h.cumulative(),
+                    "count": h.count,
+                    "sum": h.total,
+                }
+                for k, h in self.histograms.items()
+            },
+        }
+
+    def to_json(self, path: str | Path | None = None) -> str:
+        """Serialise metrics to JSON, optionally writing them to ``path``."""
+        text = json.dumps(self.to_dict(), indent=2, sort_keys=True)
+        if path is not None:
+            Path(path).write_text(text + "\n")
+        return text
+
+    def to_prometheus(self, prefix: str = "ld_mapper") -> str:
+        """Render metrics in the Prometheus text exposition format."""
+        _check_name(prefix)
+        lines: List[str] = []
+        for name in sorted(self.counters):
+            metric = f"{prefix}_{name}" if name.endswith("_total") else f"{prefix}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {_fmt(self.counters[name])}")
+        for name in sorted(self.gauges):
+            metric = f"{prefix}_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {_fmt(self.gauges[name])}")
+        if self.stages:
+            for suffix, attr in (
+                ("stage_calls_total", "calls"),
+                ("stage_wall_seconds_total", "wall_seconds"),
+                ("stage_cpu_seconds_total", "cpu_seconds"),
+            ):
+                metric = f"{prefix}_{suffix}"
+                lines.append(f"# TYPE {metric} counter")
+                for stage in sorted(self.stages):
+                    value = getattr(self.stages[stage], attr)
+                    lines.append(f'{metric}{{stage="{_escape_label(stage)}"}} {_fmt(value)}')
+        for name in sorted(self.histograms):
+            hist = self.histograms[name]
+            metric = f"{prefix}_{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            for bound, cum in zip(hist.buckets, hist.cumulative()):
+                lines.append(f'{metric}_bucket{{le="{_fmt(bound)}"}} {cum}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {hist.count}')
+            lines.append(f"{metric}_sum {_fmt(hist.total)}")
+            lines.append(f"{metric}_count {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str | Path, prefix: str = "ld_mapper") -> None:
+        """Write a Prometheus textfile (e.g. for node_exporter's collector).
+
+        The file is written to a temporary sibling and renamed into place so
+        a collector never reads a partially written file.
+        """
+        path = Path(path)
+        text = self.to_prometheus(prefix=prefix)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as fh:
+                fh.write(text)
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+def _check_name(name: str) -> None:
+    if not _NAME_RE.fullmatch(name):
+        raise ValueError(f"Invalid metric name {name!r}; must match {_NAME_RE.pattern}")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
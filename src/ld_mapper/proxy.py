@@ -10,6 +10,8 @@ import time
 from dataclasses import dataclass, field
 from typing import List, Optional
 
+from .metrics import Metrics
+
 
 @dataclass
 class ProxyVariant:
@@ -56,6 +58,8 @@ class LDProxyClient:
         Search window in base pairs.
     rate_limit : float
         Minimum seconds between API calls.
+    metrics : Metrics, optional
+        Collector for API latency, rate-limit sleep and parse counters.
     """
 
     BASE_URL = "https://ldlink.nih.gov/LDlinkRest/ldproxy"
@@ -67,12 +71,14 @@ class LDProxyClient:
         genome_build: str = "grch38",
         window: int = 500_000,
         rate_limit: float = 1.0,
+        metrics: Metrics | None = None,
     ) -> None:
         self.token = token
         self.population = population
         self.genome_build = genome_build
         self.window = window
         self.rate_limit = rate_limit
+        self.metrics = metrics if metrics is not None else Metrics.disabled()
 
     def _parse_response(self, text: str, target: str) -> ProxyResult:
         """Parse the tab-delimited LDproxy API response."""
@@ -82,9 +88,11 @@ class LDProxyClient:
             result.error = "No data returned"
             return result
 
+        skipped = 0
         for line in lines[1:]:
             parts = line.split("\t")
             if len(parts) < 7:
+                skipped += 1
                 continue
             try:
                 proxy = ProxyVariant(
@@ -96,7 +104,10 @@ class LDProxyClient:
                 )
                 result.proxies.append(proxy)
             except (ValueError, IndexError):
+                skipped += 1
                 continue
+        self.metrics.incr("rows_parsed", len(result.proxies))
+        self.metrics.incr("rows_skipped", skipped)
         return result
 
     def query(self, rsid: str) -> ProxyResult:
@@ -105,9 +116,14 @@ class LDProxyClient:
         In portfolio mode (no token), returns an empty result.
         With a valid token, makes a live API call.
         """
+        with self.metrics.stage("proxy.query"):
+            return self._query(rsid)
+
+    def _query(self, rsid: str) -> ProxyResult:
         if not self.token:
             return ProxyResult(target_rsid=rsid, error="No API token configured")
 
+        metrics = self.metrics
         try:
             import urllib.request
             import urllib.parse
@@ -122,13 +138,27 @@ class LDProxyClient:
             })
             url = f"{self.BASE_URL}?{params}"
             req = urllib.request.Request(url)
+            start = time.perf_counter()
             with urllib.request.urlopen(req, timeout=30) as resp:
                 text = resp.read().decode("utf-8")
+            latency = time.perf_counter() - start
+
+            sleep_start = time.perf_counter()
             time.sleep(self.rate_limit)
-            return self._parse_response(text, rsid)
+            slept = time.perf_counter() - sleep_start
         except Exception as exc:
+            metrics.incr("api_errors")
+            metrics.emit("api_error", rsid=rsid, error_type=type(exc).__name__, error=str(exc))
             return ProxyResult(target_rsid=rsid, error=str(exc))
 
+        metrics.incr("api_requests")
+        metrics.observe("api_latency_seconds", latency)
+        metrics.incr("rate_limit_sleep_seconds", slept)
+        metrics.emit("api_request", rsid=rsid, latency_seconds=latency)
+        with metrics.stage("proxy.parse"):
+            return self._parse_response(text, rsid)
+
     def query_batch(self, rsids: List[str]) -> List[ProxyResult]:
         """Query proxies for multiple variants with rate limiting."""
-        return [self.query(r) for r in rsids]
+        with self.metrics.stage("proxy.batch"):
+            return [self.query(r) for r in rsids]
@@ -0,0 +1,98 @@
+"""Smoke tests for the benchmark suite."""
+
+import json
+
+import pytest
+
+from benchmarks.fake_ldlink import FakeLDlinkServer
+from benchmarks.run import compare, main
+from benchmarks.synthetic import SyntheticBiobank
+from ld_mapper.mapper import ParticipantMapper
+from ld_mapper.proxy import LDProxyClient
+
+
+class TestSyntheticBiobank:
+    def test_seeded_output_is_reproducible(self, tmp_path):
+        a = SyntheticBiobank(n_participants=20, n_array_variants=100, seed=7)
+        b = SyntheticBiobank(n_participants=20, n_array_variants=100, seed=7)
+        a.write_participant_file(tmp_path / "a.csv")
+        b.write_participant_file(tmp_path / "b.csv")
+        assert (tmp_path / "a.csv").read_text() == (tmp_path / "b.csv").read_text()
+        assert a.ldproxy_responses() == b.ldproxy_responses()
+        assert a.blocklist() == b.blocklist()
+
+    def test_participant_file_loads(self, tmp_path):
+        bank = SyntheticBiobank(n_participants=50, n_array_variants=100, variants_per_participant=5)
+        mapper = ParticipantMapper(bank.write_participant_file(tmp_path / "p.csv"))
+        assert len(mapper.participants) == 50
+
+    def test_response_parses(self):
+        bank = SyntheticBiobank(n_array_variants=100, proxies_per_target=50, malformed_fraction=0.0)
+        result = LDProxyClient()._parse_response(bank.ldproxy_response("rs1"), "rs1")
+        assert len(result.proxies) == 50
+
+
+class TestFakeLDlinkServer:
+    def test_client_round_trip(self):
+        bank = SyntheticBiobank(n_array_variants=100, proxies_per_target=10, malformed_fraction=0.0)
+        with FakeLDlinkServer(bank) as server:
+            client = LDProxyClient(token="t", rate_limit=0.0)
+            client.BASE_URL = server.base_url
+            results = client.query_batch(["rs1", "rs2"])
+        assert [r.error for r in results] == [None, None]
+        assert all(len(r.proxies) == 10 for r in results)
+        assert server.requests == 2
+
+
+class TestRunner:
+    def test_main_writes_results_and_compares(self, tmp_path):
+        out = tmp_path / "bench.json"
+        args = ["--scales", "50", "100", "--array-variants", "200", "--targets", "5",
+                "--proxies-per-target", "20", "--queries", "3", "--repeat", "1",
+                "--output", str(out)]
+        assert main(args) == 0
+        report = json.loads(out.read_text())
+        names = {r["name"] for r in report["results"]}
+        assert {"mapper.load", "mapper.map", "proxy.query_batch"} <= names
+        scales = {(r["name"], r["scale"]) for r in report["results"]}
+        assert {("mapper.load", 50), ("mapper.load", 100)} <= scales
+        assert [r["scale"] for r in report["results"] if r["name"] == "proxy.parse_response"] == [5]
+        client_case = next(r for r in report["results"] if r["name"] == "proxy.query_batch")
+        assert client_case["peak_bytes_includes_server"] is True
+        assert compare(report, report, threshold=0.0) == ([], [])
+
+
+def _report(results, repeat=3, queries=200, server_latency=0.0, **params):
+    meta = {"repeat": repeat, "queries": queries, "server_latency": server_latency, "params": {"seed": 0, **params}}
+    return {"meta": meta, "results": results}
+
+
+class TestCompare:
+    def test_flags_slowdown(self):
+        base = _report([{"name": "mapper.map", "scale": 10, "min_seconds": 1.0}])
+        slow = _report([{"name": "mapper.map", "scale": 10, "min_seconds": 1.5}])
+        regressions, notes = compare(slow, base, threshold=0.2)
+        assert len(regressions) == 1
+        assert notes == []
+
+    def test_reports_unmatched_cases(self):
+        base = _report([{"name": "mapper.map", "scale": 10, "min_seconds": 1.0}])
+        cur = _report([{"name": "mapper.load", "scale": 10, "min_seconds": 1.0}])
+        regressions, notes = compare(cur, base, threshold=0.2)
+        assert regressions == ["mapper.map (scale=10): missing from current run"]
+        assert notes == ["mapper.load (scale=10): not in baseline"]
+
+    def test_refuses_different_settings(self):
+        base = _report([], n_targets=50)
+        with pytest.raises(ValueError, match="n_targets"):
+            compare(_report([], n_targets=10), base, threshold=0.2)
+        with pytest.raises(ValueError, match="repeat"):
+            compare(_report([], repeat=5, n_targets=50), base, threshold=0.2)
+
+    def test_refuses_different_query_count(self):
+        with pytest.raises(ValueError, match="queries: 200 -> 50"):
+            compare(_report([], queries=50), _report([]), threshold=0.2)
+
+    def test_refuses_different_server_latency(self):
+        with pytest.raises(ValueError, match="server_latency: 0.0 -> 0.05"):
+            compare(_report([], server_latency=0.05), _report([]), threshold=0.2)
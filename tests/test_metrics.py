@@ -0,0 +1,227 @@
+"""Tests for Metrics instrumentation."""
+
+import csv
+import io
+import json
+import urllib.request
+
+import pytest
+
+from ld_mapper.filter import ProxyFilter
+from ld_mapper.mapper import ParticipantMapper
+from ld_mapper.metrics import Histogram, Metrics
+from ld_mapper.proxy import LDProxyClient, ProxyResult, ProxyVariant
+
+
+SAMPLE_RESPONSE = """RS Number\tCoord\tAlleles\tMAF\tDistance\tDprime\tR2
+rs123\tchr6:12345\tA/G\t0.15\t0\t1.0\t1.0
+rs456\tchr6:12400\tT/C\t0.20\t55\t0.95\tNA
+short\tline
+"""
+
+
+class _FakeResponse(io.BytesIO):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class TestMetrics:
+    def test_disabled_records_nothing(self):
+        m = Metrics.disabled()
+        events = []
+        m.add_hook(lambda e, p: events.append(e))
+        m.incr("a")
+        m.set_gauge("b", 1)
+        m.observe("c", 0.2)
+        with m.stage("d"):
+            pass
+        assert m.to_dict() == {"counters": {}, "gauges": {}, "stages": {}, "histograms": {}}
+        assert events == []
+
+    def test_stage_timing_and_hook(self):
+        events = []
+        m = Metrics(hooks=[lambda e, p: events.append((e, p))])
+        with m.stage("work"):
+            sum(range(1000))
+        with m.stage("work"):
+            pass
+        assert m.stages["work"].calls == 2
+        assert m.stages["work"].wall_seconds >= 0
+        assert [e for e, _ in events] == ["stage", "stage"]
+        assert events[0][1]["stage"] == "work"
+
+    def test_histogram_buckets(self):
+        h = Histogram(buckets=(0.1, 1.0))
+        for v in (0.05, 0.5, 0.1, 5.0):
+            h.observe(v)
+        assert h.cumulative() == [2, 3]
+        assert h.count == 4
+
+    def test_json_export(self, tmp_path):
+        m = Metrics()
+        m.incr("rows_parsed", 3)
+        m.observe("api_latency_seconds", 0.2)
+        out = tmp_path / "metrics.json"
+        m.to_json(out)
+        data = json.loads(out.read_text())
+        assert data["counters"]["rows_parsed"] == 3
+        assert data["histograms"]["api_latency_seconds"]["count"] == 1
+
+    def test_prometheus_export(self):
+        m = Metrics()
+        m.incr("api_requests")
+        m.set_gauge("participants_loaded", 2)
+        m.observe("api_latency_seconds", 0.2)
+        with m.stage("filter.batch"):
+            pass
+        text = m.to_prometheus()
+        assert "ld_mapper_api_requests_total 1" in text
+        assert "ld_mapper_participants_loaded 2" in text
+        assert 'ld_mapper_api_latency_seconds_bucket{le="0.25"} 1' in text
+        assert 'ld_mapper_api_latency_seconds_bucket{le="+Inf"} 1' in text
+        assert 'ld_mapper_stage_calls_total{stage="filter.batch"} 1' in text
+
+    def test_write_prometheus_replaces_file(self, tmp_path):
+        out = tmp_path / "ld_mapper.prom"
+        out.write_text("stale\n")
+        m = Metrics()
+        m.incr("api_requests")
+        m.write_prometheus(out)
+        assert out.read_text() == m.to_prometheus()
+        assert [p.name for p in tmp_path.iterdir()] == ["ld_mapper.prom"]
+
+    def test_invalid_metric_name_rejected(self):
+        m = Metrics()
+        with pytest.raises(ValueError):
+            m.incr("proxy.rows")
+        with pytest.raises(ValueError):
+            m.set_gauge("1bad", 1)
+        with pytest.raises(ValueError):
+            m.observe("a-b", 0.1)
+        assert m.to_dict()["counters"] == {}
+
+    def test_prometheus_total_suffix_and_label_escaping(self):
+        m = Metrics()
+        m.incr("bytes_total", 5)
+        with m.stage('odd"stage\\name'):
+            pass
+        text = m.to_prometheus()
+        assert "ld_mapper_bytes_total 5" in text
+        assert "_total_total" not in text
+        assert 'stage="odd\\"stage\\\\name"' in text
+
+
+class TestPipelineInstrumentation:
+    def test_parse_counters(self):
+        m = Metrics()
+        client = LDProxyClient(metrics=m)
+        result = client._parse_response(SAMPLE_RESPONSE, "rs999")
+        assert len(result.proxies) == 1
+        assert m.counters["rows_parsed"] == 1
+        assert m.counters["rows_skipped"] == 2
+
+    def test_query_latency_and_sleep(self, monkeypatch):
+        monkeypatch.setattr(
+            urllib.request, "urlopen",
+            lambda req, timeout: _FakeResponse(SAMPLE_RESPONSE.encode()),
+        )
+        m = Metrics()
+        client = LDProxyClient(token="t", rate_limit=0.0, metrics=m)
+        client.query_batch(["rs1", "rs2"])
+        assert m.counters["api_requests"] == 2
+        assert m.histograms["api_latency_seconds"].count == 2
+        assert "rate_limit_sleep_seconds" in m.counters
+        assert m.stages["proxy.batch"].calls == 1
+        assert m.stages["proxy.query"].calls == 2
+        assert m.stages["proxy.parse"].calls == 2
+
+    def test_single_query_is_timed(self, monkeypatch):
+        monkeypatch.setattr(
+            urllib.request, "urlopen",
+            lambda req, timeout: _FakeResponse(SAMPLE_RESPONSE.encode()),
+        )
+        m = Metrics()
+        LDProxyClient(token="t", rate_limit=0.0, metrics=m).query("rs1")
+        assert m.stages["proxy.query"].calls == 1
+        assert "proxy.batch" not in m.stages
+
+    def test_query_error_is_counted(self, monkeypatch):
+        def _fail(req, timeout):
+            raise OSError("boom")
+
+        monkeypatch.setattr(urllib.request, "urlopen", _fail)
+        events = []
+        m = Metrics(hooks=[lambda e, p: events.append((e, p))])
+        client = LDProxyClient(token="t", rate_limit=0.0, metrics=m)
+        result = client.query("rs1")
+        assert result.error == "boom"
+        assert m.counters["api_errors"] == 1
+        assert ("api_error", {"rsid": "rs1", "error_type": "OSError", "error": "boom"}) in events
+
+    def test_raising_hook_does_not_fail_query(self, monkeypatch):
+        monkeypatch.setattr(
+            urllib.request, "urlopen",
+            lambda req, timeout: _FakeResponse(SAMPLE_RESPONSE.encode()),
+        )
+
+        def _bad_hook(event, payload):
+            raise RuntimeError("hook bug")
+
+        m = Metrics(hooks=[_bad_hook])
+        client = LDProxyClient(token="t", rate_limit=0.0, metrics=m)
+        result = client.query("rs1")
+        assert result.error is None
+        assert len(result.proxies) == 1
+        assert m.counters["api_requests"] == 1
+        assert "api_errors" not in m.counters
+        assert m.counters["hook_errors"] == 3
+
+    def test_raising_hook_does_not_escape_filter_or_mapper(self, tmp_path):
+        def _bad_hook(event, payload):
+            raise RuntimeError("hook bug")
+
+        m = Metrics(hooks=[_bad_hook])
+        pf = ProxyFilter(metrics=m)
+        assert pf.filter_batch([ProxyResult(target_rsid="rs1")])[0].count == 0
+        part = tmp_path / "part.csv"
+        part.write_text("participant_id,variant_id\nP001,rs11\n")
+        mapper = ParticipantMapper(part, metrics=m)
+        assert mapper.participants == ["P001"]
+        assert m.counters["hook_errors"] == 2
+
+    def test_filter_counters(self):
+        m = Metrics()
+        pf = ProxyFilter(min_r2=1.0, blocklist={"rs2"}, metrics=m)
+        pf.filter_batch([
+            ProxyResult(
+                target_rsid="rs1",
+                proxies=[
+                    ProxyVariant(rsid="rs2", r2=1.0),
+                    ProxyVariant(rsid="rs3", r2=1.0),
+                    ProxyVariant(rsid="rs4", r2=0.5),
+                ],
+            )
+        ])
+        assert m.counters["proxies_retained"] == 1
+        assert m.counters["proxies_blocklisted"] == 1
+        assert m.counters["proxies_below_r2"] == 1
+        assert m.stages["filter.batch"].calls == 1
+
+    def test_mapper_metrics(self, tmp_path):
+        pf = tmp_path / "part.csv"
+        with open(pf, "w", newline="") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(["participant_id", "variant_id"])
+            writer.writerows([["P001", "rs11"], ["P002", "rs21"], ["P003", ""]])
+        m = Metrics()
+        mapper = ParticipantMapper(pf, metrics=m)
+        mapping = mapper.map([])
+        ParticipantMapper.export_csv(mapping, tmp_path / "out.csv", metrics=m)
+        assert m.gauges["participants_loaded"] == 2
+        assert m.counters["participant_rows_loaded"] == 2
+        assert m.counters["participant_rows_skipped"] == 1
+        assert set(m.stages) == {"mapper.load", "mapper.map", "mapper.export"}
+        assert "peak_memory_bytes" in m.gauges